@@ -105,6 +105,121 @@ def get_certs(domain, cert_dir, dns_class, email):
         return False
 
 
+PROFILE_DEFAULT = 'default'
+PROFILES = {
+    PROFILE_DEFAULT: {
+        'proxy_http_version': '1.1',
+        'proxy_read_timeout': '90'
+    },
+    'streaming': {
+        'proxy_http_version': '1.1',
+        'gzip': 'off',
+        'proxy_buffering': 'off',
+        'proxy_request_buffering': 'off',
+        'proxy_connect_timeout': '10',
+        'proxy_read_timeout': '3600',
+        'proxy_send_timeout': '3600'
+    },
+    'api': {
+        'proxy_http_version': '1.1',
+        'gzip': 'on',
+        'gzip_proxied': 'any',
+        'gzip_comp_level': '5',
+        'gzip_min_length': '1024',
+        'gzip_vary': 'on',
+        'gzip_types': 'application/json application/xml text/plain text/xml',
+        'proxy_buffering': 'on',
+        'proxy_buffer_size': '16k',
+        'proxy_buffers': '16 16k',
+        'proxy_busy_buffers_size': '32k',
+        'proxy_request_buffering': 'on',
+        'proxy_connect_timeout': '10',
+        'proxy_read_timeout': '90'
+    },
+    'static': {
+        'proxy_http_version': '1.1',
+        'gzip': 'on',
+        'gzip_proxied': 'any',
+        'gzip_comp_level': '6',
+        'gzip_min_length': '256',
+        'gzip_vary': 'on',
+        'gzip_types': 'text/css text/plain text/xml application/javascript application/json image/svg+xml',
+        'proxy_buffering': 'on',
+        'proxy_buffer_size': '8k',
+        'proxy_buffers': '32 8k',
+        'proxy_request_buffering': 'on',
+        'proxy_connect_timeout': '10',
+        'proxy_read_timeout': '60'
+    }
+}
+
+
+PROFILE_BASE_KEY = 'extends'
+PROFILE_RESERVED_DIRECTIVES = ('proxy_pass', 'proxy_redirect', 'proxy_set_header')
+
+
+def load_profiles(custom_profiles):
+    # Profiles from config.yml extend the profile named in "extends", otherwise the built-in
+    # profile with the same name (or the default profile). Directives without a value are removed.
+    result = {name: dict(directives) for (name, directives) in PROFILES.items()}
+    if not custom_profiles:
+        return result
+    if not isinstance(custom_profiles, dict):
+        sys.exit('{t.normal}{t.bold}{t.red}Invalid "profiles" configuration: expected a mapping of profile names to directives.{t.normal}'.format(
+            t=Terminal()))
+
+    pending = {}
+    for (name, directives) in custom_profiles.items():
+        if directives is None:
+            directives = {}
+        if not isinstance(directives, dict):
+            print('{t.normal}{t.red}{t.bold}Profile "{profile}" is ignored, because it is not a mapping of directives.{t.normal}'.format(
+                t=Terminal(), profile=name))
+            continue
+        pending[name] = dict(directives)
+
+    # Resolve profiles whose base is available, until no more progress can be made
+    while pending:
+        progress = False
+        for (name, directives) in list(pending.items()):
+            base_name = directives.get(PROFILE_BASE_KEY, name if name in PROFILES else PROFILE_DEFAULT)
+            if base_name in pending and base_name != name:
+                continue
+            del pending[name]
+            progress = True
+            if base_name not in result:
+                print('{t.normal}{t.red}{t.bold}Profile "{profile}" extends unknown profile "{base}" and is ignored.{t.normal}'.format(
+                    t=Terminal(), profile=name, base=base_name))
+                continue
+            profile = dict(result[base_name])
+            for (directive, value) in directives.items():
+                if directive == PROFILE_BASE_KEY:
+                    continue
+                if directive in PROFILE_RESERVED_DIRECTIVES:
+                    print('{t.normal}{t.red}{t.bold}Directive "{directive}" in profile "{profile}" is ignored, because it is generated by revprox.{t.normal}'.format(
+                        t=Terminal(), directive=directive, profile=name))
+                    continue
+                if value is None:
+                    profile.pop(directive, None)
+                else:
+                    profile[directive] = value
+            result[name] = profile
+        if not progress:
+            print('{t.normal}{t.red}{t.bold}Profiles "{profiles}" are ignored, because they extend each other.{t.normal}'.format(
+                t=Terminal(), profiles='", "'.join(pending.keys())))
+            break
+    return result
+
+
+def profile_directive_value(value):
+    # YAML turns on/off into booleans, NGINX expects them as words
+    if isinstance(value, bool):
+        return 'on' if value else 'off'
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(v) for v in value)
+    return str(value)
+
+
 def generation_comment(what, subject):
     now = datetime.now().strftime("%H:%M on %B %d, %Y")
     return '{w} for {s}, generated by revprox at {t}'.format(w=what, s=subject, t=now)
@@ -137,7 +252,8 @@ def create_nginx_config_for_domain(domain, subdomains, subdomain_dir, forward_ot
     return c
 
 
-def create_nginx_config_for_subdomain(domain, subdomain, destination, use_ssl, force_ssl, cert_dir):
+def create_nginx_config_for_subdomain(domain, subdomain, destination, use_ssl, force_ssl, cert_dir,
+                                      profile_name=PROFILE_DEFAULT, profiles=PROFILES):
     full_domain = '{sub}.{main}'.format(main=domain, sub=subdomain)
     c = nginx.Conf()
     c.add(nginx.Comment(generation_comment('NGINX config', full_domain)))
@@ -167,20 +283,23 @@ def create_nginx_config_for_subdomain(domain, subdomain, destination, use_ssl, f
             nginx.Key('ssl_certificate', str(cert_dir / 'certificate.crt')),
             nginx.Key('ssl_certificate_key', str(cert_dir / 'certificate.key'))
         )
+    location = nginx.Location('/',
+                              nginx.Key('proxy_set_header', 'Host $host'),
+                              nginx.Key('proxy_set_header', 'X-Real-IP $remote_addr'),
+                              nginx.Key('proxy_set_header', 'X-Forwarded-For $proxy_add_x_forwarded_for'),
+                              nginx.Key('proxy_set_header', 'X-Forwarded-Proto $scheme'),
+                              nginx.Key('proxy_set_header', 'Upgrade $http_upgrade'),
+                              nginx.Key('proxy_set_header', 'Connection $connection_upgrade'),
+                              nginx.Key('proxy_pass', destination)
+                              )
+    location.add(nginx.Comment('profile = {}'.format(profile_name)))
+    for (directive, value) in profiles[profile_name].items():
+        location.add(nginx.Key(directive, profile_directive_value(value)))
+    location.add(nginx.Key('proxy_redirect',
+                           '{dst} {proto}://{full}'.format(dst=destination, full=full_domain, proto=proto)))
     main.add(
         nginx.Key('server_name', full_domain),
-        nginx.Location('/',
-                       nginx.Key('proxy_set_header', 'Host $host'),
-                       nginx.Key('proxy_set_header', 'X-Real-IP $remote_addr'),
-                       nginx.Key('proxy_set_header', 'X-Forwarded-For $proxy_add_x_forwarded_for'),
-                       nginx.Key('proxy_set_header', 'X-Forwarded-Proto $scheme'),
-                       nginx.Key('proxy_set_header', 'Upgrade $http_upgrade'),
-                       nginx.Key('proxy_set_header', 'Connection $connection_upgrade'),
-                       nginx.Key('proxy_pass', destination),
-                       nginx.Key('proxy_read_timeout', '90'),
-                       nginx.Key('proxy_redirect',
-                                 '{dst} {proto}://{full}'.format(dst=destination, full=full_domain, proto=proto))
-                       )
+        location
     )
     c.add(main)
     return c
@@ -268,6 +387,9 @@ if default_dns not in dns_providers:
 print('{t.normal}Using DNS provider {t.bold}{t.magenta}{provider}{t.normal} as the default provider.'.format(
     t=Terminal(), provider=default_dns))
 
+# Process performance profiles
+profiles = load_profiles(config.get('profiles'))
+
 
 # Process domain configuration
 domain_names = []
@@ -310,9 +432,23 @@ for (domain, cfg) in config['domains'].items():
         if generate_config:
             # NGINX config
             subdomains = []
-            for (subdomain, destination) in cfg['subdomains'].items():
+            domain_profile = cfg.get('profile', PROFILE_DEFAULT)
+            for (subdomain, sub) in cfg['subdomains'].items():
+                destination = sub
+                profile_name = domain_profile
+                if isinstance(sub, dict):
+                    destination = sub.get('destination')
+                    profile_name = sub.get('profile', domain_profile)
+                if not destination:
+                    print('{t.normal}{t.red}{t.bold}Subdomain "{sub}.{domain}" has no destination configured.{t.normal}'.format(
+                        t=Terminal(), sub=subdomain, domain=domain))
+                    continue
+                if profile_name not in profiles:
+                    print('{t.normal}{t.red}{t.bold}Subdomain "{sub}.{domain}" is configured to use profile "{profile}", but it is not found. Available profiles: "{avail}".{t.normal}'.format(
+                        t=Terminal(), sub=subdomain, domain=domain, profile=profile_name, avail='", "'.join(profiles.keys())))
+                    continue
                 sub_cfg = create_nginx_config_for_subdomain(
-                    domain, subdomain, destination, use_ssl, force_ssl, domain_cert)
+                    domain, subdomain, destination, use_ssl, force_ssl, domain_cert, profile_name, profiles)
                 nginx.dumpf(sub_cfg, str(subdomain_nginx / '{}.cfg'.format(subdomain)))
                 subdomains.append(subdomain)
 